@@ -0,0 +1,183 @@
+"""Psychrometric helpers for the humidity calculator (kPa and °C throughout, no Streamlit)."""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    def njit(*_args, **_kwargs):
+        return lambda func: func
+
+# ---------- Unit conversion constants ----------
+MMHG_PER_KPA = 7.50061683        # 1 kPa = 7.50061683 mmHg
+KPA_PER_MMHG = 1.0 / MMHG_PER_KPA # 0.133322368 kPa per mmHg
+
+# ---------- Buck (1981) and psychrometer constants ----------
+# e_s(T) = A * exp((B - T/D) * T/(C + T)); the 1/D reciprocal turns the hot-path divide into a multiply.
+_BUCK_A = 0.61121
+_BUCK_B = 18.678
+_BUCK_C = 257.14
+_BUCK_INV_D = 1.0 / 234.5
+# A = 0.00066 * (1 + 0.00115 * T_wb) = _PSYCHRO_A0 + _PSYCHRO_A1 * T_wb
+_PSYCHRO_A0 = 0.00066
+_PSYCHRO_A1 = 0.00066 * 0.00115
+
+# ---------- Helper functions (work in kPa internally) ----------
+def _saturation_vapor_pressure_exact_kpa(t_c: float) -> float:
+    """Buck (1981) equation for saturation vapor pressure over liquid water. T in °C, returns kPa."""
+    return _BUCK_A * math.exp((_BUCK_B - t_c * _BUCK_INV_D) * (t_c / (_BUCK_C + t_c)))
+
+def saturation_vapor_pressure_kpa_array(t_c: np.ndarray) -> np.ndarray:
+    """Vectorized Buck (1981) equation for arrays of temperatures (°C), returns kPa."""
+    t_c = np.asarray(t_c, dtype=np.float64)
+    return _BUCK_A * np.exp((_BUCK_B - t_c * _BUCK_INV_D) * (t_c / (_BUCK_C + t_c)))
+
+# Buck lookup table: 0.05 °C steps over [-50, 70] °C, linear interpolation error < 1e-5 relative.
+# Stored as a plain list because indexing a list is much cheaper than indexing an ndarray.
+_SVP_TABLE_T_MIN = -50.0
+_SVP_TABLE_T_MAX = 70.0
+_SVP_TABLE_STEPS_PER_C = 20.0
+_SVP_TABLE = saturation_vapor_pressure_kpa_array(
+    _SVP_TABLE_T_MIN + np.arange(int((_SVP_TABLE_T_MAX - _SVP_TABLE_T_MIN) * _SVP_TABLE_STEPS_PER_C) + 1) / _SVP_TABLE_STEPS_PER_C
+).tolist()
+
+@lru_cache(maxsize=8192)
+def saturation_vapor_pressure_kpa(t_c: float) -> float:
+    """Saturation vapor pressure (kPa) at T (°C), interpolated from the Buck lookup table."""
+    if not (_SVP_TABLE_T_MIN <= t_c < _SVP_TABLE_T_MAX):
+        return _saturation_vapor_pressure_exact_kpa(t_c)
+    idx_f = (t_c - _SVP_TABLE_T_MIN) * _SVP_TABLE_STEPS_PER_C
+    i = int(idx_f)
+    frac = idx_f - i
+    lo = _SVP_TABLE[i]
+    return lo + frac * (_SVP_TABLE[i + 1] - lo)
+
+def psychrometric_constant_kpa_per_c(t_wb_c: float, p_kpa: float) -> float:
+    """Psychrometric coefficient gamma = A * P, where A = 0.00066 * (1 + 0.00115 * T_wb)."""
+    return (_PSYCHRO_A0 + _PSYCHRO_A1 * t_wb_c) * p_kpa
+
+def actual_vapor_pressure_and_es_kpa(t_db_c: float, t_wb_c: float, p_kpa: float) -> tuple:
+    """(e, e_s(Tdb)): e = e_ws(Twb) - gamma * (Tdb - Twb), clamped to [0, e_s(Tdb)]."""
+    e_ws_wb = saturation_vapor_pressure_kpa(t_wb_c)
+    es_db = saturation_vapor_pressure_kpa(t_db_c)
+    gamma = psychrometric_constant_kpa_per_c(t_wb_c, p_kpa)
+    e = min(max(0.0, e_ws_wb - gamma * (t_db_c - t_wb_c)), es_db)
+    return e, es_db
+
+def actual_vapor_pressure_kpa(t_db_c: float, t_wb_c: float, p_kpa: float) -> float:
+    """e = e_ws(Twb) - gamma * (Tdb - Twb), clamped to [0, e_s(Tdb)]."""
+    return actual_vapor_pressure_and_es_kpa(t_db_c, t_wb_c, p_kpa)[0]
+
+def humidity_ratio_kg_per_kg_dry_air(e_kpa: float, p_kpa: float) -> float:
+    """Humidity ratio (omega) in kg water/kg dry air."""
+    denom = p_kpa - e_kpa
+    if denom < 1e-9:  # e >= P is unphysical (sliders keep P >> e_s); no dry air left
+        return float("inf")
+    return 0.62198 * e_kpa / denom
+
+def specific_humidity_kg_per_kg_moist_air(omega: float) -> float:
+    """Specific humidity q = omega / (1 + omega)."""
+    return omega / (1.0 + omega)
+
+# Dew-point search bracket (°C); e_s is monotonic here, so [e_s(min), e_s(max)] brackets every root
+_DEW_POINT_T_MIN = -100.0
+_DEW_POINT_T_MAX = 100.0
+_DEW_POINT_MAX_ITER = 60
+_DEW_POINT_E_MIN_KPA = _saturation_vapor_pressure_exact_kpa(_DEW_POINT_T_MIN)
+_DEW_POINT_E_MAX_KPA = _saturation_vapor_pressure_exact_kpa(_DEW_POINT_T_MAX)
+
+@njit(fastmath=True, cache=True)
+def _dew_point_kernel(e_kpa: float) -> float:
+    """Bracketed Halley solve of Buck's equation for e_s(T_MIN) <= e_kpa <= e_s(T_MAX) (Buck inlined for numba).
+
+    Steps that would leave the current bracket fall back to bisection, so the solve cannot diverge.
+    """
+    lo = _DEW_POINT_T_MIN
+    hi = _DEW_POINT_T_MAX
+    # Closed-form Magnus inversion (Buck without the T/234.5 term) as the starting guess
+    ln_ratio = math.log(e_kpa / _BUCK_A)
+    t = _BUCK_C * ln_ratio / (_BUCK_B - ln_ratio)
+    if not lo < t < hi:
+        t = 0.5 * (lo + hi)
+    tol = 1e-9 * e_kpa
+    for _ in range(_DEW_POINT_MAX_ITER):
+        # Analytic derivatives of Buck: e_s = A * exp(g), g = u * v,
+        # u = B - T/D, v = T/(C + T); r = 1/(C + T) is shared by v, v' = C*r^2 and v'' = -2*C*r^3
+        r = 1.0 / (_BUCK_C + t)
+        u = _BUCK_B - t * _BUCK_INV_D
+        v = t * r
+        es = _BUCK_A * math.exp(u * v)
+        f = es - e_kpa
+        if abs(f) < tol:
+            break
+        if f > 0.0:
+            hi = t
+        else:
+            lo = t
+        if hi - lo < 1e-12:
+            break
+        dv = _BUCK_C * r * r
+        dg = -v * _BUCK_INV_D + u * dv
+        d2g = -2.0 * dv * (_BUCK_INV_D + u * r)
+        df = es * dg
+        d2f = es * (d2g + dg * dg)
+        denom = 2.0 * df * df - f * d2f
+        # Halley step (cubic convergence); plain Newton if the Halley denominator degenerates
+        if abs(denom) > 1e-12:
+            t_next = t - 2.0 * f * df / denom
+        elif df > 0.0:
+            t_next = t - f / df
+        else:
+            t_next = lo
+        t = t_next if lo < t_next < hi else 0.5 * (lo + hi)
+    return t
+
+_dew_point_kernel(1.0)  # compile at import so the first rerun does not pay for the JIT
+
+@lru_cache(maxsize=4096)
+def dew_point_from_vapor_pressure(e_kpa: float) -> float:
+    """Invert Buck via bracketed Halley iteration for dew point (°C) given vapor pressure (kPa).
+
+    Returns NaN when e <= 0 or the dew point falls outside [-100, 100] °C.
+    """
+    if not _DEW_POINT_E_MIN_KPA <= e_kpa <= _DEW_POINT_E_MAX_KPA:
+        return float("nan")
+    return _dew_point_kernel(e_kpa)
+
+def _buck_newton_step(t_c: np.ndarray, e_kpa: np.ndarray) -> np.ndarray:
+    """Newton correction f/f' for Buck's equation, evaluated in the dtype of t_c."""
+    r = 1.0 / (_BUCK_C + t_c)
+    u = _BUCK_B - t_c * _BUCK_INV_D
+    v = t_c * r
+    es = _BUCK_A * np.exp(u * v)
+    des = es * (-v * _BUCK_INV_D + u * _BUCK_C * r * r)
+    return (es - e_kpa) / des
+
+def dew_point_from_vapor_pressure_array(e_kpa: np.ndarray) -> np.ndarray:
+    """Vectorized dew point (°C) for arrays of vapor pressure (kPa).
+
+    Newton iterations run in float32 over the whole array, then one float64 step restores full precision.
+    Like dew_point_from_vapor_pressure, returns NaN where e <= 0 or the dew point is outside [-100, 100] °C.
+    """
+    e64 = np.asarray(e_kpa, dtype=np.float64)
+    e32 = e64.astype(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ln_ratio = np.log(e32 / np.float32(_BUCK_A))
+        t = _BUCK_C * ln_ratio / (_BUCK_B - ln_ratio)
+        for _ in range(5):
+            t -= _buck_newton_step(t, e32)
+        t = t.astype(np.float64)
+        t -= _buck_newton_step(t, e64)
+    in_range = (e64 >= _DEW_POINT_E_MIN_KPA) & (e64 <= _DEW_POINT_E_MAX_KPA)
+    return np.where(in_range, t, np.nan)
+
+def compute_psychrometrics(t_db_c: float, t_wb_c: float, p_kpa: float) -> tuple:
+    """Full pipeline -> (e, e_s(Tdb), RH %, omega, q, Tdp)."""
+    e_kpa, es_db_kpa = actual_vapor_pressure_and_es_kpa(t_db_c, t_wb_c, p_kpa)
+    rh = (e_kpa / es_db_kpa) * 100.0 if es_db_kpa > 0 else float("nan")
+    omega = humidity_ratio_kg_per_kg_dry_air(e_kpa, p_kpa)
+    q = specific_humidity_kg_per_kg_moist_air(omega)
+    t_dp = dew_point_from_vapor_pressure(e_kpa)
+    return e_kpa, es_db_kpa, rh, omega, q, t_dp